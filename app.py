@@ -1,70 +1,118 @@
-from flask import Flask, jsonify, send_from_directory
+import time
+_import_started = time.perf_counter()
+
+from flask import Flask, jsonify, send_from_directory, request, Response, stream_with_context
 from flask_cors import CORS
+import csv
+import io
 import os
 from datetime import datetime
 import threading
-import time
 
-# Import the bot
-from bid_monitor_bot import BidMonitorBot
+# Only the read side is imported here; the scraping stack loads lazily in the scanner
+from bid_store import BidStore, DEFAULT_STORE_PATH
 
 app = Flask(__name__, static_folder='static', static_url_path='')
 CORS(app)
 
-# Global storage
-bids_cache = []
-last_update = None
+# Scan results written by the scanner (embedded thread or separate process)
+store = BidStore(os.environ.get('BID_STORE_PATH', DEFAULT_STORE_PATH))
+
+# EMBEDDED_SCANNER=0 when scans run in their own process (`python scanner.py`)
+embedded_scanner = os.environ.get('EMBEDDED_SCANNER', '1') == '1'
 monitor_running = False
+monitor_lock = threading.Lock()
 
-def run_monitor():
-    """Run the bid monitor and update cache"""
-    global bids_cache, last_update
-    
-    try:
-        print(f"\n🔄 Running OHIO STATEWIDE monitor at {datetime.now()}")
-        bot = BidMonitorBot()
-        
-        # Run ALL Ohio scrapers
-        opportunities = bot.run_all_scrapers()
-        
-        # Update cache
-        bids_cache = opportunities
-        last_update = datetime.now().isoformat()
-        
-        print(f"✅ Found {len(bids_cache)} REAL opportunities across Ohio")
-        return True
-        
-    except Exception as e:
-        print(f"❌ Monitor error: {e}")
-        import traceback
-        traceback.print_exc()
-        return False
-
-def monitor_loop():
-    """Background monitoring every 6 hours"""
-    global monitor_running
-    monitor_running = True
-    
-    while True:
-        run_monitor()
-        print("⏰ Next statewide scan in 6 hours...")
-        time.sleep(6 * 3600)
+def run_monitor(profile=None):
+    """Run one scan in this process and save it to the store"""
+    from scanner import run_scan
+    return run_scan(store, profile)
 
 def start_monitoring():
-    """Start background monitoring thread"""
+    """Start the background scan thread without blocking the request"""
     global monitor_running
     
-    if not monitor_running:
-        print("🚀 Starting OHIO STATEWIDE bid monitor...")
-        
-        # Run immediately
-        run_monitor()
+    if not embedded_scanner:
+        return
+    
+    with monitor_lock:
+        if monitor_running:
+            return
+        monitor_running = True
+    
+    print("🚀 Starting OHIO STATEWIDE bid monitor...")
+    
+    from scanner import scan_loop
+    thread = threading.Thread(target=scan_loop, args=(store,), daemon=True)
+    thread.start()
+    
+    print("✅ Statewide monitor started!")
+
+EXPORT_COLUMNS = [
+    ('Title', 'title'),
+    ('Type', 'type'),
+    ('Location', 'location'),
+    ('Source', 'source'),
+    ('Posted Date', 'posted_date'),
+    ('Deadline', 'deadline'),
+    ('Bid Number', 'bid_number'),
+    ('URL', 'url'),
+    ('Description', 'description'),
+    ('Score', 'score'),
+]
+
+def filter_bids(bids, args):
+    """Yield bids matching the ?type= and ?q= query filters"""
+    bid_type = args.get('type', 'all')
+    search = args.get('q', '').strip().lower()
+    
+    for bid in bids:
+        if bid_type != 'all' and bid.get('type') != bid_type:
+            continue
         
-        # Start background thread
-        thread = threading.Thread(target=monitor_loop, daemon=True)
-        thread.start()
+        if search:
+            searchable = ' '.join(
+                bid.get(field) or '' for field in ('title', 'description', 'location', 'bid_number')
+            ).lower()
+            if search not in searchable:
+                continue
         
-        print("✅ Statewide monitor started!")
+        yield bid
+
+def export_value(bid, field):
+    """Cell value for an export column; keeps falsy numbers like a 0.0 score"""
+    value = bid.get(field)
+    return '' if value is None else value
+
+def csv_safe(value):
+    """Stop spreadsheet apps from running scraped text as a formula"""
+    if isinstance(value, str) and value.startswith(('=', '+', '-', '@', '\t', '\r')):
+        return f"'{value}"
+    return value
+
+def generate_csv(bids):
+    """Stream CSV one row at a time"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    
+    def flush():
+        value = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate(0)
+        return value
+    
+    writer.writerow([header for header, _ in EXPORT_COLUMNS])
+    yield flush()
+    for bid in bids:
+        writer.writerow([csv_safe(export_value(bid, field)) for _, field in EXPORT_COLUMNS])
+        yield flush()
+
+def generate_xlsx(bids):
+    """Stream an XLSX workbook as rows are written"""
+    from xlsx_stream import stream_xlsx
+    
+    rows = ([export_value(bid, field) for _, field in EXPORT_COLUMNS] for bid in bids)
+    return stream_xlsx([header for header, _ in EXPORT_COLUMNS], rows, sheet_name='Bids')
 
 # Routes
 @app.route('/')
@@ -87,12 +135,16 @@ def health():
     if not monitor_running:
         start_monitoring()
     
+    data = store.load()
+    
     return jsonify({
         'status': 'ok',
         'message': 'Ohio Statewide Bid Monitor is running',
-        'bids_count': len(bids_cache),
-        'last_update': last_update,
+        'bids_count': len(data['bids']),
+        'last_update': data['last_update'],
         'monitor_active': monitor_running,
+        'embedded_scanner': embedded_scanner,
+        'startup_seconds': STARTUP_SECONDS,
         'coverage': 'All of Ohio - State, Counties, Major Cities'
     })
 
@@ -101,28 +153,59 @@ def get_bids():
     if not monitor_running:
         start_monitoring()
     
+    data = store.load()
+    bids = list(filter_bids(data['bids'], request.args))
+    
     return jsonify({
         'success': True,
-        'count': len(bids_cache),
-        'bids': bids_cache,
-        'last_update': last_update
+        'count': len(bids),
+        'bids': bids,
+        'last_update': data['last_update']
     })
 
+@app.route('/api/export')
+def export_bids():
+    export_format = request.args.get('format', 'csv')
+    date_stamp = datetime.now().strftime('%Y-%m-%d')
+    bids = filter_bids(store.load()['bids'], request.args)
+    
+    if export_format == 'csv':
+        return Response(
+            stream_with_context(generate_csv(bids)),
+            mimetype='text/csv',
+            headers={'Content-Disposition': f'attachment; filename=bids_{date_stamp}.csv'}
+        )
+    
+    if export_format == 'xlsx':
+        return Response(
+            stream_with_context(generate_xlsx(bids)),
+            mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+            headers={'Content-Disposition': f'attachment; filename=bids_{date_stamp}.xlsx'}
+        )
+    
+    return jsonify({
+        'success': False,
+        'message': f'Unsupported export format: {export_format}'
+    }), 400
+
 @app.route('/api/statistics')
 def get_stats():
     if not monitor_running:
         start_monitoring()
     
+    data = store.load()
+    bids = data['bids']
+    
     stats = {
-        'total': len(bids_cache),
-        'municipal': len([b for b in bids_cache if b.get('type') == 'Municipal']),
-        'county': len([b for b in bids_cache if b.get('type') == 'County']),
-        'state': len([b for b in bids_cache if b.get('type') == 'State']),
+        'total': len(bids),
+        'municipal': len([b for b in bids if b.get('type') == 'Municipal']),
+        'county': len([b for b in bids if b.get('type') == 'County']),
+        'state': len([b for b in bids if b.get('type') == 'State']),
     }
     
     # Count by source
     sources = {}
-    for bid in bids_cache:
+    for bid in bids:
         source = bid.get('source', 'Unknown')
         sources[source] = sources.get(source, 0) + 1
     
@@ -130,20 +213,48 @@ def get_stats():
         'success': True,
         'statistics': stats,
         'sources': sources,
-        'last_update': last_update
+        'last_update': data['last_update']
     })
 
 @app.route('/api/refresh', methods=['POST', 'GET'])
 def refresh():
-    success = run_monitor()
+    if not embedded_scanner:
+        return jsonify({
+            'success': False,
+            'message': 'Scans run in the scanner process; refresh is disabled on the web tier'
+        }), 409
+    
+    # ?profile=stages|cprofile|sample captures a profile of this scan
+    profile = request.args.get('profile')
+    from scan_profiler import PROFILE_MODES
+    if profile and profile not in PROFILE_MODES:
+        return jsonify({
+            'success': False,
+            'message': f'Unknown profile mode: {profile}'
+        }), 400
+    
+    success = run_monitor(profile)
+    data = store.load()
     
     return jsonify({
         'success': success,
         'message': 'Statewide refresh completed' if success else 'Refresh failed',
-        'bids_count': len(bids_cache),
-        'last_update': last_update
+        'bids_count': len(data['bids']),
+        'last_update': data['last_update']
+    })
+
+@app.route('/api/scan-report')
+def scan_report():
+    data = store.load()
+    
+    return jsonify({
+        'success': True,
+        'report': data.get('scan_report') or {'enabled': False},
+        'last_update': data['last_update']
     })
 
+STARTUP_SECONDS = round(time.perf_counter() - _import_started, 3)
+
 # For local testing
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5000))
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Async Fetch Backend for the Ohio Bid Monitor
+Pooled keep-alive connections with total and per-host concurrency caps
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import aiohttp
+
+
+@dataclass
+class FetchResult:
+    """Outcome of fetching a single page"""
+    url: str
+    status: int = 0
+    content: bytes = b''
+    error: str = ''
+    truncated: bool = False
+    # Phase -> seconds (queue, dns, connect, first_byte, body) when tracing is on
+    timings: Dict[str, float] = field(default_factory=dict)
+
+
+class AsyncFetcher:
+    def __init__(self, headers: Optional[Dict[str, str]] = None, timeout: float = 10,
+                 max_connections: int = 20, max_per_host: int = 2,
+                 keepalive_timeout: float = 30, max_body_bytes: int = 5 * 1024 * 1024,
+                 chunk_size: int = 64 * 1024, trace_timings: bool = False):
+        self.headers = dict(headers or {})
+        # Let aiohttp negotiate compression and decode the stream as it arrives
+        self.headers.setdefault('Accept-Encoding', 'gzip, deflate')
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.max_per_host = max_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.max_body_bytes = max_body_bytes
+        self.chunk_size = chunk_size
+        self.trace_timings = trace_timings
+
+    def fetch_all(self, urls: List[str], timeouts: Optional[Dict[str, float]] = None) -> Dict[str, FetchResult]:
+        """Fetch every URL concurrently and return results keyed by URL"""
+        unique_urls = list(dict.fromkeys(urls))
+        return asyncio.run(self._fetch_many(unique_urls, timeouts or {}))
+
+    async def _fetch_many(self, urls: List[str], timeouts: Dict[str, float]) -> Dict[str, FetchResult]:
+        connector = aiohttp.TCPConnector(
+            limit=self.max_connections,
+            limit_per_host=self.max_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            ttl_dns_cache=300,
+        )
+        # No total timeout: it would also count time spent queued for a pooled connection
+        timeout = aiohttp.ClientTimeout(total=None, sock_connect=self.timeout, sock_read=self.timeout)
+        trace_configs = [self._trace_config()] if self.trace_timings else []
+
+        async with aiohttp.ClientSession(connector=connector, headers=self.headers,
+                                         timeout=timeout, auto_decompress=True,
+                                         trace_configs=trace_configs) as session:
+            results = await asyncio.gather(*(
+                self._fetch_one(session, url, timeouts.get(url, self.timeout)) for url in urls
+            ))
+
+        return {result.url: result for result in results}
+
+    def _trace_config(self) -> 'aiohttp.TraceConfig':
+        """Record pool wait, DNS, connect (incl. TLS) and time-to-headers per request"""
+        def mark(name):
+            async def handler(session, context, params):
+                context.trace_request_ctx[name] = time.perf_counter()
+            return handler
+
+        trace_config = aiohttp.TraceConfig()
+        trace_config.on_request_start.append(mark('request_start'))
+        trace_config.on_connection_queued_start.append(mark('queued_start'))
+        trace_config.on_connection_queued_end.append(mark('queued_end'))
+        trace_config.on_dns_resolvehost_start.append(mark('dns_start'))
+        trace_config.on_dns_resolvehost_end.append(mark('dns_end'))
+        trace_config.on_connection_create_start.append(mark('connect_start'))
+        trace_config.on_connection_create_end.append(mark('connect_end'))
+        trace_config.on_request_end.append(mark('headers'))
+        return trace_config
+
+    def _phase_timings(self, marks: Dict[str, float]) -> Dict[str, float]:
+        timings = {}
+        if 'queued_end' in marks:
+            # Waiting for a free pooled connection is local contention, not the server
+            timings['queue'] = marks['queued_end'] - marks['queued_start']
+        if 'dns_end' in marks:
+            timings['dns'] = marks['dns_end'] - marks['dns_start']
+        if 'connect_end' in marks:
+            # aiohttp's connection_create span includes the DNS lookup
+            timings['connect'] = marks['connect_end'] - marks['connect_start'] - timings.get('dns', 0.0)
+        if 'headers' in marks:
+            # Measure from when the request actually had a connection to send on
+            waited_from = max(marks[name] for name in ('request_start', 'queued_end', 'connect_end')
+                              if name in marks)
+            timings['first_byte'] = marks['headers'] - waited_from
+        return timings
+
+    async def _fetch_one(self, session: 'aiohttp.ClientSession', url: str, timeout: float) -> FetchResult:
+        result = FetchResult(url=url)
+        marks: Dict[str, float] = {}
+        # Connect and per-read limits only start once the request has a connection slot
+        request_timeout = aiohttp.ClientTimeout(total=None, sock_connect=timeout, sock_read=timeout)
+
+        try:
+            async with session.get(url, timeout=request_timeout, trace_request_ctx=marks) as response:
+                result.status = response.status
+                if response.status != 200:
+                    return result
+
+                body_started = time.perf_counter()
+
+                # Stream the (already decompressed) body and stop at the size cap
+                chunks = []
+                size = 0
+                async for chunk in response.content.iter_chunked(self.chunk_size):
+                    remaining = self.max_body_bytes - size
+                    if len(chunk) >= remaining:
+                        chunks.append(chunk[:remaining])
+                        # A body that ends exactly at the cap is complete; peek to tell the two apart
+                        result.truncated = len(chunk) > remaining or bool(await response.content.read(1))
+                        break
+                    chunks.append(chunk)
+                    size += len(chunk)
+
+                result.content = b''.join(chunks)
+                if self.trace_timings:
+                    result.timings = self._phase_timings(marks)
+                    result.timings['body'] = time.perf_counter() - body_started
+
+        except asyncio.TimeoutError:
+            result.error = f"Timed out after {timeout}s"
+        except Exception as e:
+            result.error = str(e)[:100]
+
+        return result
@@ -5,15 +5,59 @@ Comprehensive statewide coverage with expanded water infrastructure keywords
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
 import json
 from datetime import datetime, timedelta
+import os
 import re
-from typing import List, Dict
+from typing import List, Dict, Optional
 import time
 
+from relevance import RelevanceScorer
+from template_fingerprints import TemplateStore
+from scan_profiler import ScanProfiler, SCAN_SOURCE
+
 class BidMonitorBot:
-    def __init__(self):
+    # Sources grouped by region, in scan order
+    SCAN_PLAN = [
+        ('STATE AGENCIES', [
+            'scrape_ohio_state_das', 'scrape_odot', 'scrape_ohio_epa',
+        ]),
+        ('NORTHEAST OHIO CITIES', [
+            'scrape_cleveland', 'scrape_akron', 'scrape_canton',
+            'scrape_youngstown', 'scrape_lorain',
+        ]),
+        ('CENTRAL OHIO CITIES', [
+            'scrape_columbus', 'scrape_dublin', 'scrape_westerville',
+        ]),
+        ('SOUTHWEST OHIO CITIES', [
+            'scrape_cincinnati', 'scrape_dayton', 'scrape_hamilton',
+            'scrape_springfield',
+        ]),
+        ('NORTHWEST OHIO CITIES', [
+            'scrape_toledo', 'scrape_findlay', 'scrape_bowling_green',
+        ]),
+        ('NORTHEAST OHIO COUNTIES', [
+            'scrape_cuyahoga_county', 'scrape_summit_county', 'scrape_stark_county',
+            'scrape_lorain_county', 'scrape_lake_county',
+        ]),
+        ('CENTRAL OHIO COUNTIES', [
+            'scrape_franklin_county', 'scrape_delaware_county', 'scrape_fairfield_county',
+        ]),
+        ('SOUTHWEST OHIO COUNTIES', [
+            'scrape_hamilton_county', 'scrape_butler_county', 'scrape_warren_county',
+            'scrape_montgomery_county', 'scrape_clark_county',
+        ]),
+        ('NORTHWEST OHIO COUNTIES', [
+            'scrape_lucas_county', 'scrape_wood_county',
+        ]),
+        ('AGGREGATOR PLATFORMS', [
+            'scrape_bidnet_direct', 'scrape_demandstar',
+        ]),
+    ]
+    
+    def __init__(self, fetch_backend: Optional[str] = None, profiler: Optional[ScanProfiler] = None):
         # EXPANDED KEYWORDS - Water Infrastructure Focus
         self.keywords = [
             # Stormwater & Drainage
@@ -59,6 +103,22 @@ class BidMonitorBot:
             'grading', 'excavation', 'sitework'
         ]
         
+        # Specificity-weighted scoring; links below min_score are dropped
+        self.scorer = RelevanceScorer(
+            self.keywords,
+            min_score=float(os.environ.get('BID_MIN_SCORE', 1.0))
+        )
+        
+        # Menus, footers and sidebars learned from previous scans of each source
+        self.templates = None
+        if os.environ.get('BID_TEMPLATE_SUPPRESSION', '1') == '1':
+            self.templates = TemplateStore(
+                os.environ.get('BID_TEMPLATE_DIR', os.path.join('.bid_monitor', 'templates')),
+                streak=int(os.environ.get('BID_TEMPLATE_STREAK', 3)),
+                chrome_streak=int(os.environ.get('BID_TEMPLATE_CHROME_STREAK', 2)),
+                min_age_hours=float(os.environ.get('BID_TEMPLATE_MIN_AGE_HOURS', 12))
+            )
+        
         self.opportunities = []
         self.session = requests.Session()
         self.session.headers.update({
@@ -66,63 +126,63 @@ class BidMonitorBot:
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.5',
         })
+        # Keep-alive pool sized for the number of distinct hosts we scan
+        adapter = HTTPAdapter(pool_connections=40, pool_maxsize=4)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
         
         self.timeout = 10
+        
+        # 'sync' fetches each source in turn; 'async' fetches them concurrently
+        self.fetch_backend = fetch_backend or os.environ.get('BID_FETCH_BACKEND', 'sync')
+        self.max_connections = int(os.environ.get('BID_MAX_CONNECTIONS', 20))
+        self.max_per_host = int(os.environ.get('BID_MAX_PER_HOST', 2))
+        self.max_body_bytes = int(os.environ.get('BID_MAX_BODY_BYTES', 5 * 1024 * 1024))
+        self._deferred = None
+        
+        # Stage timings are only collected when profiling is switched on
+        self.profiler = profiler or ScanProfiler()
     
-    def contains_keywords(self, text: str) -> bool:
-        """Check if text contains any of our target keywords"""
-        if not text:
-            return False
-        text_lower = text.lower()
-        return any(keyword in text_lower for keyword in self.keywords)
-    
-    def safe_scrape(self, url: str, source_name: str, location: str, bid_type: str):
+    def safe_scrape(self, url: str, source_name: str, location: str, bid_type: str,
+                    timeout: Optional[float] = None, max_links: Optional[int] = None,
+                    anchor_only: bool = False, min_title_length: int = 15):
         """Generic scraper with error handling"""
-        print(f"🔍 Checking {source_name}...")
+        job = {
+            'url': url,
+            'source_name': source_name,
+            'location': location,
+            'bid_type': bid_type,
+            'timeout': timeout or self.timeout,
+            'max_links': max_links,
+            'anchor_only': anchor_only,
+            'min_title_length': min_title_length,
+        }
+        
+        # Deferred mode (async backend or job collection): queue the page, fetch later
+        if self._deferred is not None:
+            self._deferred.append(job)
+            return True
+        
+        return self._scrape_job(job)
+    
+    def _scrape_job(self, job: Dict):
+        """Fetch and parse a single page with the sync session"""
+        print(f"🔍 Checking {job['source_name']}...")
+        
+        source = job['source_name']
         
         try:
-            response = self.session.get(url, timeout=self.timeout)
+            # requests can't split DNS/connect from the wait, so first_byte includes them
+            with self.profiler.stage(source, 'fetch.first_byte'):
+                response = self.session.get(job['url'], timeout=job['timeout'], stream=True)
             
             if response.status_code == 200:
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                # Find all links
-                links = soup.find_all('a', href=True)
-                count = 0
-                
-                for link in links:
-                    link_text = link.get_text(strip=True)
-                    href = link.get('href', '')
-                    
-                    # Check if link text or surrounding context matches keywords
-                    parent_text = link.parent.get_text(strip=True) if link.parent else ''
-                    combined_text = f"{link_text} {parent_text}"
-                    
-                    if self.contains_keywords(combined_text) and len(link_text) > 15:
-                        # Build full URL
-                        if href.startswith('http'):
-                            full_url = href
-                        elif href.startswith('/'):
-                            base_url = '/'.join(url.split('/')[:3])
-                            full_url = f"{base_url}{href}"
-                        else:
-                            full_url = url
-                        
-                        self.opportunities.append({
-                            'source': source_name,
-                            'title': link_text[:250],
-                            'url': full_url,
-                            'posted_date': datetime.now().strftime('%Y-%m-%d'),
-                            'location': location,
-                            'type': bid_type,
-                            'bid_number': self._extract_bid_number(link_text),
-                            'description': parent_text[:300] if len(parent_text) > len(link_text) else ''
-                        })
-                        count += 1
-                
-                print(f"   ✓ Found {count} opportunities")
+                with self.profiler.stage(source, 'fetch.body'):
+                    content = response.content
+                self._process_page(content, job)
                 return True
             else:
+                response.close()
                 print(f"   ⚠ HTTP {response.status_code}")
                 return False
             
@@ -130,6 +190,144 @@ class BidMonitorBot:
             print(f"   ⚠ Error: {str(e)[:100]}")
             return False
     
+    def _process_page(self, content: bytes, job: Dict):
+        """Extract keyword-matching links from a fetched page"""
+        url = job['url']
+        source = job['source_name']
+        
+        with self.profiler.stage(source, 'parse'):
+            soup = BeautifulSoup(content, 'html.parser')
+            
+            # Find all links
+            links = soup.find_all('a', href=True)
+            if job['max_links']:
+                links = links[:job['max_links']]  # Limit to prevent overwhelming
+        
+        # Skip navigation and boilerplate before any keyword work
+        template_scan = None
+        if self.templates:
+            total_links = len(links)
+            with self.profiler.stage(source, 'templates'):
+                links, template_scan = self.templates.filter_links(source, links)
+            if total_links > len(links):
+                print(f"   ↷ Skipped {total_links - len(links)} template links")
+        
+        # Gather candidates first so the whole page is scored in one pass
+        candidates = []
+        # Links in the same container reuse one copy of its text
+        parent_texts = {}
+        with self.profiler.stage(source, 'context'):
+            for link in links:
+                # Join text nodes with spaces so keywords at node boundaries stay separate words
+                link_text = link.get_text(' ', strip=True)
+                if len(link_text) <= job['min_title_length']:
+                    continue
+                
+                # Score link text and surrounding context
+                if job['anchor_only'] or link.parent is None:
+                    parent_text = ''
+                else:
+                    parent_text = parent_texts.get(id(link.parent))
+                    if parent_text is None:
+                        parent_text = parent_texts[id(link.parent)] = link.parent.get_text(' ', strip=True)
+                candidates.append((link, link_text, parent_text))
+        
+        with self.profiler.stage(source, 'match'):
+            scores = self.scorer.score_batch([(link_text, parent_text) for _, link_text, parent_text in candidates])
+        count = 0
+        bid_number_seconds = 0.0
+        
+        for (link, link_text, parent_text), score in zip(candidates, scores):
+            if score < self.scorer.min_score:
+                continue
+            
+            href = link.get('href', '')
+            
+            # Build full URL
+            if href.startswith('http'):
+                full_url = href
+            elif href.startswith('/'):
+                base_url = '/'.join(url.split('/')[:3])
+                full_url = f"{base_url}{href}"
+            else:
+                full_url = url
+            
+            started = time.perf_counter()
+            bid_number = self._extract_bid_number(link_text)
+            bid_number_seconds += time.perf_counter() - started
+            
+            self.opportunities.append({
+                'source': job['source_name'],
+                'title': link_text[:250],
+                'url': full_url,
+                'posted_date': datetime.now().strftime('%Y-%m-%d'),
+                'location': job['location'],
+                'type': job['bid_type'],
+                'bid_number': bid_number,
+                'description': parent_text[:300] if len(parent_text) > len(link_text) else '',
+                'score': score
+            })
+            count += 1
+        
+        self.profiler.record(source, 'bid_number', bid_number_seconds)
+        
+        # Blocks that yield an opportunity are never learned as template.
+        # Saved after the results so a failed write can't cost this source's bids.
+        if template_scan is not None:
+            try:
+                with self.profiler.stage(source, 'templates'):
+                    self.templates.record_scan(source, template_scan, [
+                        link for (link, _, _), score in zip(candidates, scores) if score >= self.scorer.min_score
+                    ])
+            except OSError as e:
+                print(f"   ⚠ Could not save template fingerprints: {str(e)[:100]}")
+        
+        print(f"   ✓ Found {count} opportunities")
+    
+    def _scrape_deferred(self):
+        """Fetch all queued pages concurrently, then parse them in scan order"""
+        from async_fetcher import AsyncFetcher
+        
+        jobs, self._deferred = self._deferred, None
+        fetcher = AsyncFetcher(
+            headers=dict(self.session.headers),
+            timeout=self.timeout,
+            max_connections=self.max_connections,
+            max_per_host=self.max_per_host,
+            max_body_bytes=self.max_body_bytes,
+            trace_timings=self.profiler.enabled,
+        )
+        print(f"\n⚡ Fetching {len(jobs)} sources concurrently...")
+        with self.profiler.stage(SCAN_SOURCE, 'fetch.concurrent'):
+            results = fetcher.fetch_all(
+                [job['url'] for job in jobs],
+                timeouts={job['url']: job['timeout'] for job in jobs}
+            )
+        
+        for job in jobs:
+            print(f"🔍 Checking {job['source_name']}...")
+            result = results[job['url']]
+            for phase, seconds in result.timings.items():
+                self.profiler.record(job['source_name'], f"fetch.{phase}", seconds)
+            
+            if result.error:
+                print(f"   ⚠ Error: {result.error}")
+            elif result.status != 200:
+                print(f"   ⚠ HTTP {result.status}")
+            else:
+                if result.truncated:
+                    print(f"   ⚠ Page truncated at {self.max_body_bytes} bytes")
+                # One bad page must not sink the rest of the batch
+                try:
+                    self._process_page(result.content, job)
+                except Exception as e:
+                    print(f"   ⚠ Error: {str(e)[:100]}")
+    
+    def _pause(self):
+        """Be polite between serial requests; the async pool paces itself"""
+        if self._deferred is None:
+            time.sleep(2)
+    
     # STATE LEVEL
     def scrape_ohio_state_das(self):
         """Ohio DAS eProcurement System"""
@@ -439,42 +637,17 @@ class BidMonitorBot:
     # AGGREGATOR PLATFORMS
     def scrape_bidnet_direct(self):
         """BidNet Direct - Major procurement platform"""
-        print("🔍 Checking BidNet Direct (Ohio agencies)...")
-        
-        try:
-            # BidNet hosts many Ohio municipalities
-            url = "https://www.bidnetdirect.com/ohio"
-            response = self.session.get(url, timeout=15)
-            
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.content, 'html.parser')
-                
-                # Look for bid listings
-                links = soup.find_all('a', href=True)
-                count = 0
-                
-                for link in links[:50]:  # Limit to prevent overwhelming
-                    link_text = link.get_text(strip=True)
-                    href = link.get('href', '')
-                    
-                    if self.contains_keywords(link_text) and len(link_text) > 20:
-                        full_url = href if href.startswith('http') else f"https://www.bidnetdirect.com{href}"
-                        
-                        self.opportunities.append({
-                            'source': 'BidNet Direct (Ohio)',
-                            'title': link_text[:250],
-                            'url': full_url,
-                            'posted_date': datetime.now().strftime('%Y-%m-%d'),
-                            'location': 'Various Ohio Locations',
-                            'type': 'Municipal',
-                            'bid_number': self._extract_bid_number(link_text)
-                        })
-                        count += 1
-                
-                print(f"   ✓ Found {count} opportunities")
-            
-        except Exception as e:
-            print(f"   ⚠ Error: {str(e)[:100]}")
+        # BidNet hosts many Ohio municipalities
+        self.safe_scrape(
+            "https://www.bidnetdirect.com/ohio",
+            "BidNet Direct (Ohio)",
+            "Various Ohio Locations",
+            "Municipal",
+            timeout=15,
+            max_links=50,
+            anchor_only=True,
+            min_title_length=20
+        )
     
     def scrape_demandstar(self):
         """DemandStar - Another major platform"""
@@ -525,6 +698,36 @@ class BidMonitorBot:
         
         self.opportunities = unique_opps
     
+    def rank_opportunities(self):
+        """Order opportunities by relevance score, best first"""
+        self.opportunities.sort(key=lambda opp: opp.get('score', 0), reverse=True)
+    
+    def collect_jobs(self) -> List[Dict]:
+        """List every page the scan would fetch, tagged with its region"""
+        jobs = []
+        for region, scrapers in self.SCAN_PLAN:
+            self._deferred = []
+            for scraper in scrapers:
+                getattr(self, scraper)()
+            for job in self._deferred:
+                job['region'] = region
+            jobs.extend(self._deferred)
+        
+        self._deferred = None
+        return jobs
+    
+    def scrape_jobs(self, jobs: List[Dict]) -> List[Dict]:
+        """Scrape a pre-built list of jobs (one shard of a coordinated scan)"""
+        if self.fetch_backend == 'async':
+            self._deferred = list(jobs)
+            self._scrape_deferred()
+        else:
+            for job in jobs:
+                self._scrape_job(job)
+                self._pause()
+        
+        return self.opportunities
+    
     def run_all_scrapers(self):
         """Run all scrapers for comprehensive Ohio coverage"""
         print("\n" + "="*80)
@@ -532,116 +735,32 @@ class BidMonitorBot:
         print("="*80)
         print(f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         print(f"Keywords: {len(self.keywords)} water infrastructure terms")
+        print(f"Fetch backend: {self.fetch_backend}")
         print()
         
-        # STATE LEVEL (3)
-        print("\n📍 STATE AGENCIES:")
-        self.scrape_ohio_state_das()
-        time.sleep(2)
-        self.scrape_odot()
-        time.sleep(2)
-        self.scrape_ohio_epa()
-        time.sleep(2)
-        
-        # NORTHEAST OHIO - Cities (5)
-        print("\n📍 NORTHEAST OHIO CITIES:")
-        self.scrape_cleveland()
-        time.sleep(2)
-        self.scrape_akron()
-        time.sleep(2)
-        self.scrape_canton()
-        time.sleep(2)
-        self.scrape_youngstown()
-        time.sleep(2)
-        self.scrape_lorain()
-        time.sleep(2)
-        
-        # CENTRAL OHIO - Cities (3)
-        print("\n📍 CENTRAL OHIO CITIES:")
-        self.scrape_columbus()
-        time.sleep(2)
-        self.scrape_dublin()
-        time.sleep(2)
-        self.scrape_westerville()
-        time.sleep(2)
-        
-        # SOUTHWEST OHIO - Cities (4)
-        print("\n📍 SOUTHWEST OHIO CITIES:")
-        self.scrape_cincinnati()
-        time.sleep(2)
-        self.scrape_dayton()
-        time.sleep(2)
-        self.scrape_hamilton()
-        time.sleep(2)
-        self.scrape_springfield()
-        time.sleep(2)
-        
-        # NORTHWEST OHIO - Cities (3)
-        print("\n📍 NORTHWEST OHIO CITIES:")
-        self.scrape_toledo()
-        time.sleep(2)
-        self.scrape_findlay()
-        time.sleep(2)
-        self.scrape_bowling_green()
-        time.sleep(2)
-        
-        # COUNTIES - Northeast (5)
-        print("\n📍 NORTHEAST OHIO COUNTIES:")
-        self.scrape_cuyahoga_county()
-        time.sleep(2)
-        self.scrape_summit_county()
-        time.sleep(2)
-        self.scrape_stark_county()
-        time.sleep(2)
-        self.scrape_lorain_county()
-        time.sleep(2)
-        self.scrape_lake_county()
-        time.sleep(2)
-        
-        # COUNTIES - Central (3)
-        print("\n📍 CENTRAL OHIO COUNTIES:")
-        self.scrape_franklin_county()
-        time.sleep(2)
-        self.scrape_delaware_county()
-        time.sleep(2)
-        self.scrape_fairfield_county()
-        time.sleep(2)
-        
-        # COUNTIES - Southwest (5)
-        print("\n📍 SOUTHWEST OHIO COUNTIES:")
-        self.scrape_hamilton_county()
-        time.sleep(2)
-        self.scrape_butler_county()
-        time.sleep(2)
-        self.scrape_warren_county()
-        time.sleep(2)
-        self.scrape_montgomery_county()
-        time.sleep(2)
-        self.scrape_clark_county()
-        time.sleep(2)
-        
-        # COUNTIES - Northwest (2)
-        print("\n📍 NORTHWEST OHIO COUNTIES:")
-        self.scrape_lucas_county()
-        time.sleep(2)
-        self.scrape_wood_county()
-        time.sleep(2)
-        
-        # AGGREGATOR PLATFORMS (2)
-        print("\n📍 AGGREGATOR PLATFORMS:")
-        self.scrape_bidnet_direct()
-        time.sleep(2)
-        self.scrape_demandstar()
-        time.sleep(2)
+        if self.fetch_backend == 'async':
+            self._deferred = []
+        
+        for region, scrapers in self.SCAN_PLAN:
+            print(f"\n📍 {region}:")
+            for scraper in scrapers:
+                getattr(self, scraper)()
+                self._pause()
+        
+        if self._deferred is not None:
+            self._scrape_deferred()
         
         # Remove duplicates
         print("\n🔄 Processing results...")
-        self.deduplicate_opportunities()
+        # Rank first so dedup keeps the highest-scoring copy of each bid
+        with self.profiler.stage(SCAN_SOURCE, 'dedup'):
+            self.rank_opportunities()
+            self.deduplicate_opportunities()
         
         print()
         print("="*80)
         print(f"✅ SCAN COMPLETE")
-        print(f"   Total Sources Checked: 38")
+        print(f"   Total Sources Checked: {sum(len(scrapers) for _, scrapers in self.SCAN_PLAN)}")
         print(f"   Unique Opportunities Found: {len(self.opportunities)}")
         print(f"   Coverage: All of Ohio - State, 15 Cities, 15 Counties, 2 Platforms")
         print("="*80)
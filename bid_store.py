@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Bid Store shared by the scanner and the web tier
+The scanner writes scan results to a JSON file; web workers read it back cheaply.
+Both processes must see the same filesystem (same host or a shared volume).
+"""
+
+import json
+import os
+import threading
+from typing import Dict, List, Optional
+
+DEFAULT_STORE_PATH = os.path.join('.bid_monitor', 'bids.json')
+
+
+class BidStore:
+    def __init__(self, path: str = DEFAULT_STORE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._mtime = None
+        self._data = {'bids': [], 'last_update': None}
+
+    def save(self, bids: List[Dict], last_update: Optional[str], **extra):
+        """Atomically replace the stored scan results"""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        data = {'bids': bids, 'last_update': last_update}
+        data.update(extra)
+
+        # Unique per thread too: a manual refresh can overlap the scheduled scan
+        tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with self._lock:
+            with open(tmp_path, 'w') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.path)
+
+            self._data = data
+            self._mtime = os.stat(self.path).st_mtime_ns
+
+    def load(self) -> Dict:
+        """Latest scan results, re-read only when the file has changed"""
+        try:
+            mtime = os.stat(self.path).st_mtime_ns
+        except OSError:
+            return self._data
+
+        with self._lock:
+            if mtime != self._mtime:
+                try:
+                    with open(self.path) as f:
+                        self._data = json.load(f)
+                    self._mtime = mtime
+                except (OSError, ValueError) as e:
+                    print(f"⚠ Could not read bid store: {e}")
+            return self._data
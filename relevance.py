@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Relevance Scoring for Matched Opportunities
+Weights keywords by specificity and where they appear, one regex pass per page
+"""
+
+import re
+from bisect import bisect_right
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Trade-specific terms that almost never show up in page boilerplate
+HIGH_SPECIFICITY = [
+    'cipp', 'vactor', 'vac truck', 'vacuum truck', 'jet vac', 'combination truck',
+    'sewer cleaner', 'suction excavator', 'hydro excavation', 'vacuum excavation',
+    'hydro jetting', 'jetting', 'jet cleaning', 'pipe cleaning', 'line cleaning',
+    'televising', 'cctv', 'video inspection', 'camera inspection',
+    'pipeline inspection', 'sewer inspection', 'lateral inspection', 'manhole inspection',
+    'smoke testing', 'dye testing', 'pipe lining', 'slip lining', 'pipe bursting',
+    'trenchless', 'manhole rehabilitation', 'manhole repair', 'catch basin', 'catch basins',
+    'basin cleaning', 'ditch cleaning', 'channel cleaning', 'storm sewer', 'sanitary sewer',
+    'npdes', 'ms4', 'valve exercising', 'lift station', 'force main', 'sewer lateral',
+]
+
+# Broad terms that match menus, department names and page chrome
+LOW_SPECIFICITY = [
+    'clean', 'cleaning', 'utility', 'infrastructure', 'public works', 'inlet',
+    'grading', 'excavation', 'sweeping', 'drainage', 'water line', 'sitework',
+]
+
+HIGH_WEIGHT = 3.0
+DEFAULT_WEIGHT = 1.0
+LOW_WEIGHT = 0.25
+
+# Procurement language that marks a link as an actual solicitation
+BID_TERMS = {
+    'bid': 1.0, 'bids': 1.0, 'rfp': 1.0, 'rfq': 1.0, 'ifb': 1.0, 'itb': 1.0,
+    'invitation to bid': 1.0, 'request for proposal': 1.0, 'solicitation': 1.0,
+    'proposal': 0.5, 'contract': 0.5, 'project': 0.5,
+}
+
+# Navigation, social and boilerplate terms that mark a link as noise
+NEGATIVE_KEYWORDS = {
+    'login': -2.0, 'log in': -2.0, 'sign in': -2.0, 'sign up': -2.0,
+    'facebook': -3.0, 'twitter': -3.0, 'instagram': -3.0, 'youtube': -3.0, 'linkedin': -3.0,
+    'privacy policy': -3.0, 'accessibility': -2.0, 'sitemap': -3.0, 'site map': -3.0,
+    'contact us': -2.0, 'directory': -1.0, 'employment': -2.0, 'careers': -2.0,
+    'job opening': -2.0, 'news': -1.0, 'calendar': -1.0, 'agenda': -1.0,
+    'minutes': -1.0, 'faq': -1.0, 'pay your bill': -3.0, 'pay online': -3.0,
+    'report a problem': -2.0,
+}
+
+
+class RelevanceScorer:
+    def __init__(self, keywords: Iterable[str], weights: Optional[Dict[str, float]] = None,
+                 negative_keywords: Optional[Dict[str, float]] = None,
+                 anchor_weight: float = 1.0, parent_weight: float = 0.35,
+                 max_repeats: int = 2, min_score: float = 1.0):
+        self.weights = {keyword: DEFAULT_WEIGHT for keyword in keywords}
+        self.domain_terms = set(self.weights) | set(HIGH_SPECIFICITY) | set(LOW_SPECIFICITY)
+        self.weights.update({keyword: HIGH_WEIGHT for keyword in HIGH_SPECIFICITY})
+        self.weights.update({keyword: LOW_WEIGHT for keyword in LOW_SPECIFICITY})
+        self.weights.update(BID_TERMS)
+        self.weights.update(NEGATIVE_KEYWORDS if negative_keywords is None else negative_keywords)
+        if weights:
+            self.weights.update(weights)
+
+        self.anchor_weight = anchor_weight
+        self.parent_weight = parent_weight
+        self.max_repeats = max_repeats
+        self.min_score = min_score
+
+        # Longest terms first so 'pipe cleaning' wins over 'cleaning' and 'clean'.
+        # Whole words only ('bid' must not match 'bidder'), but plurals count as the term.
+        terms = sorted(self.weights, key=len, reverse=True)
+        self.pattern = re.compile(r'\b(' + '|'.join(re.escape(term) for term in terms) + r')(?:e?s)?\b')
+
+    def _count_batch(self, texts: List[str]) -> List[Counter]:
+        """Count term hits for every text with a single regex scan"""
+        counts = [Counter() for _ in texts]
+        if not texts:
+            return counts
+
+        # Lowercase before measuring offsets - lower() can change string length
+        texts = [text.lower() for text in texts]
+
+        starts = []
+        offset = 0
+        for text in texts:
+            starts.append(offset)
+            offset += len(text) + 1
+
+        combined = '\x00'.join(texts)
+        for match in self.pattern.finditer(combined):
+            counts[bisect_right(starts, match.start()) - 1][match.group(1)] += 1
+
+        return counts
+
+    def score_batch(self, pairs: List[Tuple[str, str]]) -> List[float]:
+        """Score (anchor text, parent text) pairs from one page
+
+        Links that share a container share its text, so each distinct parent text is
+        scanned once and every anchor's own hits are taken back out of it.
+        """
+        parents = list(dict.fromkeys(parent for _, parent in pairs))
+        counts = self._count_batch([anchor for anchor, _ in pairs] + parents)
+        anchor_counts = counts[:len(pairs)]
+        counts_by_parent = dict(zip(parents, counts[len(pairs):]))
+
+        scores = []
+        for anchor_hits, (_, parent) in zip(anchor_counts, pairs):
+            # Score the parent's own context only
+            parent_hits = counts_by_parent[parent] - anchor_hits
+            # Bid language alone is not enough - a domain keyword has to match
+            if not self.domain_terms.intersection(anchor_hits) and \
+                    not self.domain_terms.intersection(parent_hits):
+                scores.append(0.0)
+                continue
+
+            score = 0.0
+            for term, hits in anchor_hits.items():
+                score += self.weights[term] * self.anchor_weight * min(hits, self.max_repeats)
+
+            for term, hits in parent_hits.items():
+                score += self.weights[term] * self.parent_weight * min(hits, self.max_repeats)
+
+            scores.append(round(score, 2))
+
+        return scores
@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+Sharded Scan Coordinator for the Ohio Bid Monitor
+Splits the source list into shards and farms them out to worker processes via SQLite
+"""
+
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import socket
+import sqlite3
+import sys
+import time
+import uuid
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+from bid_monitor_bot import BidMonitorBot
+from scan_profiler import ScanProfiler, SCAN_SOURCE
+
+DEFAULT_QUEUE_PATH = os.path.join('.bid_monitor', 'scan_queue.sqlite3')
+DEFAULT_SHARD_COUNT = 8
+
+# A scan whose coordinator hasn't checked in for this long is abandoned
+ABANDONED_AFTER = 300
+
+
+def shard_jobs(jobs: List[Dict], by: str = 'region', count: int = DEFAULT_SHARD_COUNT) -> Dict[str, List[Dict]]:
+    """Group scan jobs into shards by region or by a stable hash of the host"""
+    shards: Dict[str, List[Dict]] = {}
+
+    for job in jobs:
+        if by == 'region':
+            key = job.get('region', 'UNASSIGNED')
+        elif by == 'host':
+            # md5 rather than hash() so every process agrees on the shard
+            host = urlparse(job['url']).netloc.lower()
+            key = f"host-{int(hashlib.md5(host.encode('utf-8')).hexdigest(), 16) % count}"
+        else:
+            raise ValueError(f"Unknown shard strategy: {by}")
+
+        shards.setdefault(key, []).append(job)
+
+    return shards
+
+
+class ScanQueue:
+    def __init__(self, path: str = DEFAULT_QUEUE_PATH):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS shards (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    scan_id TEXT NOT NULL,
+                    shard_key TEXT NOT NULL,
+                    jobs TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    worker TEXT,
+                    claimed_at REAL,
+                    results TEXT,
+                    error TEXT
+                )
+            """)
+            conn.execute('CREATE INDEX IF NOT EXISTS idx_shards_status ON shards (status, id)')
+            # One row per live scan; the coordinator bumps the heartbeat while it waits
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS scans (
+                    scan_id TEXT PRIMARY KEY,
+                    heartbeat REAL NOT NULL
+                )
+            """)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def enqueue(self, scan_id: str, shards: Dict[str, List[Dict]]):
+        with self._connect() as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            conn.execute('INSERT INTO scans (scan_id, heartbeat) VALUES (?, ?)', (scan_id, time.time()))
+            conn.executemany(
+                'INSERT INTO shards (scan_id, shard_key, jobs) VALUES (?, ?, ?)',
+                [(scan_id, key, json.dumps(jobs)) for key, jobs in shards.items()]
+            )
+            conn.execute('COMMIT')
+
+    def heartbeat(self, scan_id: str):
+        with self._connect() as conn:
+            conn.execute('UPDATE scans SET heartbeat = ? WHERE scan_id = ?', (time.time(), scan_id))
+
+    def claim(self, worker_id: str, abandoned_after: float = ABANDONED_AFTER) -> Optional[Dict]:
+        """Atomically take the oldest pending shard of a scan that is still live"""
+        with self._connect() as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            row = conn.execute(
+                "SELECT shards.id, shards.scan_id, shard_key, jobs FROM shards "
+                "JOIN scans ON scans.scan_id = shards.scan_id "
+                "WHERE status = 'pending' AND heartbeat >= ? ORDER BY shards.id LIMIT 1",
+                (time.time() - abandoned_after,)
+            ).fetchone()
+            if row is None:
+                conn.execute('COMMIT')
+                return None
+
+            conn.execute(
+                "UPDATE shards SET status = 'running', worker = ?, claimed_at = ? WHERE id = ?",
+                (worker_id, time.time(), row['id'])
+            )
+            conn.execute('COMMIT')
+
+        return {
+            'id': row['id'],
+            'scan_id': row['scan_id'],
+            'shard_key': row['shard_key'],
+            'jobs': json.loads(row['jobs']),
+        }
+
+    def complete(self, shard_id: int, opportunities: List[Dict], timings: Optional[Dict] = None):
+        results = {'opportunities': opportunities, 'timings': timings or {}}
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE shards SET status = 'done', results = ? WHERE id = ?",
+                (json.dumps(results), shard_id)
+            )
+
+    def fail(self, shard_id: int, error: str):
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE shards SET status = 'failed', error = ? WHERE id = ?",
+                (error, shard_id)
+            )
+
+    def requeue_stale(self, max_age: float):
+        """Hand shards from crashed or hung workers back to the queue"""
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE shards SET status = 'pending', worker = NULL, claimed_at = NULL "
+                "WHERE status = 'running' AND claimed_at < ?",
+                (time.time() - max_age,)
+            )
+
+    def requeue_worker(self, worker_id: str):
+        """Hand back whatever a worker known to be dead was running"""
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE shards SET status = 'pending', worker = NULL, claimed_at = NULL "
+                "WHERE status = 'running' AND worker = ?",
+                (worker_id,)
+            )
+
+    def expire_abandoned(self, abandoned_after: float = ABANDONED_AFTER):
+        """Drop shards left behind by coordinators that died or gave up"""
+        with self._connect() as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            conn.execute('DELETE FROM scans WHERE heartbeat < ?', (time.time() - abandoned_after,))
+            conn.execute('DELETE FROM shards WHERE scan_id NOT IN (SELECT scan_id FROM scans)')
+            conn.execute('COMMIT')
+
+    def pending(self, scan_id: str) -> int:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT COUNT(*) FROM shards WHERE scan_id = ? AND status = 'pending'",
+                (scan_id,)
+            ).fetchone()
+        return row[0]
+
+    def outstanding(self, scan_id: str) -> int:
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT COUNT(*) FROM shards WHERE scan_id = ? AND status IN ('pending', 'running')",
+                (scan_id,)
+            ).fetchone()
+        return row[0]
+
+    def collect(self, scan_id: str) -> Dict:
+        """Merged shard results, per-shard stage timings and the shards that failed"""
+        opportunities = []
+        timings = []
+        failed = []
+
+        with self._connect() as conn:
+            rows = conn.execute(
+                'SELECT shard_key, status, results, error FROM shards WHERE scan_id = ? ORDER BY id',
+                (scan_id,)
+            ).fetchall()
+
+        for row in rows:
+            if row['status'] == 'done':
+                results = json.loads(row['results'])
+                opportunities.extend(results['opportunities'])
+                timings.append(results['timings'])
+            else:
+                failed.append(f"{row['shard_key']}: {row['error'] or row['status']}")
+
+        return {'opportunities': opportunities, 'timings': timings, 'failed': failed}
+
+    def purge(self, scan_id: str):
+        with self._connect() as conn:
+            conn.execute('BEGIN IMMEDIATE')
+            conn.execute('DELETE FROM shards WHERE scan_id = ?', (scan_id,))
+            conn.execute('DELETE FROM scans WHERE scan_id = ?', (scan_id,))
+            conn.execute('COMMIT')
+
+
+def worker_name(pid: int) -> str:
+    return f"{socket.gethostname()}-{pid}"
+
+
+def run_worker(queue_path: str = DEFAULT_QUEUE_PATH, exit_when_idle: bool = True, idle_sleep: float = 5,
+               profile: Optional[str] = None):
+    """Claim and scrape shards until the queue is empty (or forever)"""
+    queue = ScanQueue(queue_path)
+    worker_id = worker_name(os.getpid())
+
+    while True:
+        shard = queue.claim(worker_id)
+        if shard is None:
+            if exit_when_idle:
+                return
+            time.sleep(idle_sleep)
+            continue
+
+        print(f"🧩 [{worker_id}] Shard {shard['shard_key']}: {len(shard['jobs'])} sources")
+        try:
+            # Workers only time stages; their timings are merged into the coordinator's report
+            profiler = ScanProfiler.from_env(profile)
+            if profiler.enabled:
+                profiler = ScanProfiler('stages')
+            bot = BidMonitorBot(profiler=profiler)
+            queue.complete(shard['id'], bot.scrape_jobs(shard['jobs']), profiler.timings)
+        except Exception as e:
+            print(f"   ⚠ Shard {shard['shard_key']} failed: {str(e)[:100]}")
+            queue.fail(shard['id'], str(e)[:200])
+
+
+class ScanCoordinator:
+    def __init__(self, queue_path: str = DEFAULT_QUEUE_PATH, workers: int = 4,
+                 shard_by: str = 'region', shard_count: Optional[int] = None,
+                 poll_interval: float = 2, shard_timeout: float = 900,
+                 max_respawns: Optional[int] = None, profiler: Optional[ScanProfiler] = None):
+        self.queue = ScanQueue(queue_path)
+        self.profiler = profiler or ScanProfiler()
+        # The coordinator only polls, so a whole-scan capture here would profile time.sleep
+        self.profiler.limit_to_stages('sharded scans run in worker processes')
+        # workers=0 leaves the shards to externally started workers
+        self.workers = workers
+        self.shard_by = shard_by
+        self.shard_count = shard_count or DEFAULT_SHARD_COUNT
+        self.poll_interval = poll_interval
+        self.shard_timeout = shard_timeout
+        # Replacement workers allowed per scan before giving up on crashing shards
+        self.max_respawns = workers * 2 if max_respawns is None else max_respawns
+
+    def run_scan(self) -> List[Dict]:
+        """Shard the source list, wait for the workers, merge with global dedup"""
+        bot = BidMonitorBot(profiler=self.profiler)
+        jobs = bot.collect_jobs()
+        shards = shard_jobs(jobs, by=self.shard_by, count=self.shard_count)
+        scan_id = uuid.uuid4().hex
+
+        print(f"\n🧭 Scan {scan_id[:8]}: {len(jobs)} sources in {len(shards)} shards "
+              f"(by {self.shard_by}) across {self.workers} workers")
+        self.queue.expire_abandoned()
+        self.queue.enqueue(scan_id, shards)
+
+        # spawn, not fork - the web process has threads running
+        context = multiprocessing.get_context('spawn')
+        processes = []
+        respawns = 0
+
+        def spawn_worker():
+            process = context.Process(target=run_worker, args=(self.queue.path, True, 5, self.profiler.mode),
+                                      daemon=True)
+            process.start()
+            processes.append(process)
+
+        for _ in range(self.workers):
+            spawn_worker()
+
+        while self.queue.outstanding(scan_id):
+            time.sleep(self.poll_interval)
+            self.queue.heartbeat(scan_id)
+            self.queue.requeue_stale(self.shard_timeout)
+            if not self.workers:
+                continue
+
+            # Workers exit once the queue is empty, so hand back a dead worker's shard right away
+            for process in [process for process in processes if not process.is_alive()]:
+                processes.remove(process)
+                process.join()
+                if process.exitcode != 0:
+                    print(f"   ⚠ Worker {process.pid} exited with code {process.exitcode}")
+                    self.queue.requeue_worker(worker_name(process.pid))
+
+            # ...and top the pool back up if shards are waiting with nobody to take them
+            while self.queue.pending(scan_id) and len(processes) < self.workers and respawns < self.max_respawns:
+                respawns += 1
+                spawn_worker()
+
+            if not processes and self.queue.outstanding(scan_id):
+                print("   ⚠ Out of worker respawns with shards outstanding")
+                break
+
+        for process in processes:
+            process.join()
+
+        merged = self.queue.collect(scan_id)
+        self.queue.purge(scan_id)
+        for failure in merged['failed']:
+            print(f"   ⚠ Shard {failure}")
+        for timings in merged['timings']:
+            self.profiler.merge(timings)
+
+        bot.opportunities = merged['opportunities']
+        with self.profiler.stage(SCAN_SOURCE, 'dedup'):
+            bot.rank_opportunities()
+            bot.deduplicate_opportunities()
+
+        print(f"✅ Scan {scan_id[:8]} merged: {len(bot.opportunities)} unique opportunities")
+        return bot.opportunities
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description='Sharded Ohio bid scan')
+    parser.add_argument('--queue', default=os.environ.get('SCAN_QUEUE_PATH', DEFAULT_QUEUE_PATH))
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    scan = commands.add_parser('scan', help='Coordinate one full scan')
+    scan.add_argument('--workers', type=int, default=int(os.environ.get('SCAN_WORKERS', 4)))
+    scan.add_argument('--shard-by', choices=['region', 'host'], default=os.environ.get('SCAN_SHARD_BY', 'region'))
+    scan.add_argument('--shards', type=int, default=None)
+    scan.add_argument('--profile', choices=['off', 'stages', 'cprofile', 'sample'], default=None)
+
+    worker = commands.add_parser('worker', help='Process shards from the queue')
+    worker.add_argument('--forever', action='store_true', help='Keep polling instead of exiting when idle')
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'scan':
+        profiler = ScanProfiler.from_env(args.profile)
+        coordinator = ScanCoordinator(args.queue, workers=args.workers, shard_by=args.shard_by,
+                                      shard_count=args.shards, profiler=profiler)
+        profiler.start()
+        opportunities = coordinator.run_scan()
+        profiler.stop()
+        profiler.print_report(profiler.report())
+        print(f"\n📊 Final Results: {len(opportunities)} opportunities found")
+    else:
+        run_worker(args.queue, exit_when_idle=not args.forever)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
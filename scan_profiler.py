@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Per-Scan Profiling Hooks
+Times each stage of every source and optionally captures a cProfile or sampling profile
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Optional
+
+PROFILE_MODES = ('off', 'stages', 'cprofile', 'sample')
+CAPTURE_MODES = ('cprofile', 'sample')
+
+SCAN_SOURCE = '(scan)'
+
+
+class ScanProfiler:
+    def __init__(self, mode: str = 'off', output_dir: Optional[str] = None,
+                 sample_interval: float = 0.005):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode: {mode}")
+
+        self.mode = mode
+        self.enabled = mode != 'off'
+        self.output_dir = output_dir or os.path.join('.bid_monitor', 'profiles')
+        self.sample_interval = sample_interval
+
+        # source -> stage -> seconds
+        self.timings: Dict[str, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+        self._started = None
+        self._elapsed = 0.0
+        self._profile = None
+        self._sampler = None
+        self._samples = Counter()
+        self._stop_sampling = threading.Event()
+        self.notes = []
+
+    @classmethod
+    def from_env(cls, mode: Optional[str] = None) -> 'ScanProfiler':
+        """SCAN_PROFILE=stages|cprofile|sample (1 means stages); an explicit mode wins
+
+        An explicit mode must be valid. A bad SCAN_PROFILE only warns - a typo in a
+        diagnostics switch must not stop scans.
+        """
+        output_dir = os.environ.get('SCAN_PROFILE_DIR')
+        if mode:
+            return cls(mode, output_dir=output_dir)
+
+        mode = (os.environ.get('SCAN_PROFILE') or 'off').lower()
+        if mode in ('1', 'true', 'on'):
+            mode = 'stages'
+        elif mode in ('0', 'false', ''):
+            mode = 'off'
+        elif mode not in PROFILE_MODES:
+            print(f"⚠ Ignoring SCAN_PROFILE={mode!r}; expected one of {', '.join(PROFILE_MODES)}")
+            mode = 'off'
+        return cls(mode, output_dir=output_dir)
+
+    def limit_to_stages(self, reason: str):
+        """Fall back from whole-scan capture to stage timings, noting why in the report"""
+        if self.mode in CAPTURE_MODES:
+            self.notes.append(f"{self.mode} capture disabled: {reason}; stage timings only")
+            print(f"⚠ {self.notes[-1]}")
+            self.mode = 'stages'
+
+    @contextmanager
+    def stage(self, source: str, stage: str):
+        if not self.enabled:
+            yield
+            return
+
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(source, stage, time.perf_counter() - started)
+
+    def record(self, source: str, stage: str, seconds: float):
+        if not self.enabled:
+            return
+        with self._lock:
+            stages = self.timings.setdefault(source, {})
+            stages[stage] = stages.get(stage, 0.0) + seconds
+
+    def merge(self, timings: Dict[str, Dict[str, float]]):
+        """Fold in stage timings from another process (e.g. a scan shard)"""
+        for source, stages in (timings or {}).items():
+            for stage, seconds in stages.items():
+                self.record(source, stage, seconds)
+
+    def start(self):
+        """Begin the scan clock and any whole-scan capture"""
+        if not self.enabled:
+            return
+
+        self._started = time.perf_counter()
+        if self.mode == 'cprofile':
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        elif self.mode == 'sample':
+            self._stop_sampling.clear()
+            self._sampler = threading.Thread(
+                target=self._sample_loop, args=(threading.get_ident(),), daemon=True
+            )
+            self._sampler.start()
+
+    def stop(self):
+        if not self.enabled or self._started is None:
+            return
+
+        self._elapsed = time.perf_counter() - self._started
+        if self._profile:
+            self._profile.disable()
+        if self._sampler:
+            self._stop_sampling.set()
+            self._sampler.join()
+
+    def _sample_loop(self, thread_id: int):
+        """Poor man's sampler: record the scanning thread's stack every interval"""
+        while not self._stop_sampling.wait(self.sample_interval):
+            frame = sys._current_frames().get(thread_id)
+            if frame is None:
+                continue
+
+            stack = []
+            while frame is not None and len(stack) < 8:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            self._samples[' < '.join(stack)] += 1
+
+    def _write_capture(self, top: int) -> Dict:
+        os.makedirs(self.output_dir, exist_ok=True)
+        stamp = datetime.now().strftime('%Y%m%d-%H%M%S')
+
+        if self._profile:
+            path = os.path.join(self.output_dir, f"scan-{stamp}.prof")
+            self._profile.dump_stats(path)
+            summary = io.StringIO()
+            pstats.Stats(self._profile, stream=summary).sort_stats('cumulative').print_stats(top)
+            return {'profile_file': path, 'profile_summary': summary.getvalue()}
+
+        if self._samples:
+            path = os.path.join(self.output_dir, f"scan-{stamp}.samples.txt")
+            with open(path, 'w') as f:
+                for stack, count in self._samples.most_common():
+                    f.write(f"{count}\t{stack}\n")
+            total = sum(self._samples.values())
+            return {
+                'profile_file': path,
+                'profile_summary': [
+                    {'stack': stack, 'samples': count, 'share': round(count / total, 3)}
+                    for stack, count in self._samples.most_common(top)
+                ],
+            }
+
+        return {}
+
+    def report(self, top: int = 10) -> Dict:
+        """Ranked slowest sources and stages for this scan"""
+        if not self.enabled:
+            return {'enabled': False}
+
+        sources = [
+            {
+                'source': source,
+                'seconds': round(sum(stages.values()), 3),
+                'stages': {stage: round(seconds, 3) for stage, seconds in
+                           sorted(stages.items(), key=lambda item: item[1], reverse=True)},
+            }
+            for source, stages in self.timings.items() if source != SCAN_SOURCE
+        ]
+        sources.sort(key=lambda entry: entry['seconds'], reverse=True)
+
+        stage_totals: Dict[str, float] = {}
+        for stages in self.timings.values():
+            for stage, seconds in stages.items():
+                stage_totals[stage] = stage_totals.get(stage, 0.0) + seconds
+
+        report = {
+            'enabled': True,
+            'mode': self.mode,
+            'generated_at': datetime.now().isoformat(),
+            'total_seconds': round(self._elapsed, 3),
+            'notes': self.notes,
+            'slowest_sources': sources[:top],
+            'slowest_stages': [
+                {'stage': stage, 'seconds': round(seconds, 3)}
+                for stage, seconds in sorted(stage_totals.items(), key=lambda item: item[1], reverse=True)
+            ],
+        }
+        # A capture that can't be written must not cost the scan its results
+        try:
+            report.update(self._write_capture(top))
+        except OSError as e:
+            self.notes.append(f"{self.mode} capture not saved: {e}")
+        return report
+
+    def print_report(self, report: Dict):
+        if not report.get('enabled'):
+            return
+
+        print("\n⏱  SLOWEST SOURCES:")
+        for entry in report['slowest_sources']:
+            worst_stage = next(iter(entry['stages']), '')
+            print(f"   {entry['seconds']:7.2f}s  {entry['source']}  (mostly {worst_stage})")
+        print("⏱  TIME BY STAGE:")
+        for entry in report['slowest_stages']:
+            print(f"   {entry['seconds']:7.2f}s  {entry['stage']}")
+        for note in report.get('notes', []):
+            print(f"   ⚠ {note}")
+        if report.get('profile_file'):
+            print(f"   Profile saved to {report['profile_file']}")
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Scanner Entry Point for the Ohio Bid Monitor
+Runs statewide scans on a schedule and writes the results to the bid store
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+from typing import List, Optional
+
+from bid_store import BidStore, DEFAULT_STORE_PATH
+from scan_profiler import ScanProfiler, PROFILE_MODES
+
+SCAN_INTERVAL_HOURS = float(os.environ.get('SCAN_INTERVAL_HOURS', 6))
+
+
+def run_scan(store: BidStore, profile: Optional[str] = None) -> bool:
+    """Run one statewide scan and save the results (with a profile report if enabled)"""
+    profiler = None
+    try:
+        profiler = ScanProfiler.from_env(profile)
+        profiler.start()
+
+        print(f"\n🔄 Running OHIO STATEWIDE monitor at {datetime.now()}")
+
+        # The scraping stack is only imported by the process that scans
+        if os.environ.get('SCAN_MODE') == 'sharded':
+            # Fan the sources out to worker processes through the SQLite queue
+            from scan_coordinator import ScanCoordinator, DEFAULT_QUEUE_PATH
+            coordinator = ScanCoordinator(
+                os.environ.get('SCAN_QUEUE_PATH', DEFAULT_QUEUE_PATH),
+                workers=int(os.environ.get('SCAN_WORKERS', 4)),
+                shard_by=os.environ.get('SCAN_SHARD_BY', 'region'),
+                profiler=profiler
+            )
+            opportunities = coordinator.run_scan()
+        else:
+            from bid_monitor_bot import BidMonitorBot
+            bot = BidMonitorBot(profiler=profiler)
+
+            # Run ALL Ohio scrapers
+            opportunities = bot.run_all_scrapers()
+
+        profiler.stop()
+        try:
+            report = profiler.report()
+            profiler.print_report(report)
+        except Exception as e:
+            # Diagnostics are opt-in; the bids still get saved
+            print(f"⚠ Profile report failed: {e}")
+            report = {'enabled': False, 'error': str(e)[:200]}
+
+        store.save(opportunities, datetime.now().isoformat(), scan_report=report)
+
+        print(f"✅ Found {len(opportunities)} REAL opportunities across Ohio")
+        return True
+
+    except Exception as e:
+        if profiler:
+            profiler.stop()
+        print(f"❌ Monitor error: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def scan_loop(store: BidStore):
+    """Scan now, then every SCAN_INTERVAL_HOURS"""
+    while True:
+        run_scan(store)
+        print(f"⏰ Next statewide scan in {SCAN_INTERVAL_HOURS:g} hours...")
+        time.sleep(SCAN_INTERVAL_HOURS * 3600)
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description='Ohio statewide bid scanner')
+    parser.add_argument('--store', default=os.environ.get('BID_STORE_PATH', DEFAULT_STORE_PATH))
+    parser.add_argument('--once', action='store_true', help='Run a single scan and exit')
+    parser.add_argument('--profile', choices=PROFILE_MODES, default=None,
+                        help='Profile the scan (defaults to $SCAN_PROFILE)')
+    args = parser.parse_args(argv)
+
+    store = BidStore(args.store)
+    if args.once:
+        return 0 if run_scan(store, args.profile) else 1
+
+    scan_loop(store)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
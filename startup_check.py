@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Web Tier Startup Budget Check
+Times `import app` in a fresh interpreter and fails if it is slow or loads the scraping stack
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+STARTUP_BUDGET_SECONDS = float(os.environ.get('STARTUP_BUDGET_SECONDS', 0.5))
+
+# Modules that belong to the scanner, not the read-only web tier
+SCANNER_MODULES = [
+    'bid_monitor_bot', 'scan_coordinator', 'async_fetcher', 'relevance',
+    'template_fingerprints', 'requests', 'bs4', 'aiohttp',
+]
+
+PROBE = """
+import json, sys, time
+started = time.perf_counter()
+import app
+elapsed = time.perf_counter() - started
+print(json.dumps({'seconds': elapsed, 'modules': sorted(sys.modules)}))
+"""
+
+
+def main():
+    env = dict(os.environ, EMBEDDED_SCANNER='0')
+    result = subprocess.run(
+        [sys.executable, '-c', PROBE],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        print(result.stderr)
+        return 1
+
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    leaked = [name for name in SCANNER_MODULES if name in report['modules']]
+
+    print(f"⏱  import app: {report['seconds']:.3f}s (budget {STARTUP_BUDGET_SECONDS:.3f}s)")
+    if leaked:
+        print(f"   ⚠ Scanner modules loaded by the web tier: {', '.join(leaked)}")
+
+    if report['seconds'] > STARTUP_BUDGET_SECONDS or leaked:
+        print("❌ Startup budget check failed")
+        return 1
+
+    print("✅ Startup budget check passed")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
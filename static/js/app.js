@@ -119,6 +119,7 @@ function renderBids() {
                 <span class="badge badge-location">📍 ${bid.location}</span>
                 ${bid.deadline ? `<span class="badge badge-deadline">⏰ Due: ${formatDate(bid.deadline)}</span>` : ''}
                 ${bid.bid_number ? `<span class="badge">🔢 ${bid.bid_number}</span>` : ''}
+                ${bid.score !== undefined ? `<span class="badge">⭐ ${bid.score}</span>` : ''}
             </div>
 
             ${bid.description ? `
@@ -173,6 +174,8 @@ async function refreshBids() {
                 btn.textContent = '🔄 Refresh';
                 btn.disabled = false;
             }, 2000);
+        } else {
+            throw new Error(data.message || 'Refresh failed');
         }
     } catch (error) {
         console.error('Error refreshing:', error);
@@ -184,35 +187,18 @@ async function refreshBids() {
     }
 }
 
-// Export to CSV
+// Export to CSV (streamed by the server with the current filters)
 function exportToCSV() {
     if (filteredBids.length === 0) {
         alert('No bids to export');
         return;
     }
 
-    const headers = ['Title', 'Type', 'Location', 'Source', 'Posted Date', 'Deadline', 'Bid Number', 'URL', 'Description'];
-    
-    const csvContent = [
-        headers.join(','),
-        ...filteredBids.map(bid => [
-            `"${(bid.title || '').replace(/"/g, '""')}"`,
-            bid.type || '',
-            `"${(bid.location || '').replace(/"/g, '""')}"`,
-            `"${(bid.source || '').replace(/"/g, '""')}"`,
-            bid.posted_date || '',
-            bid.deadline || '',
-            bid.bid_number || '',
-            bid.url || '',
-            `"${(bid.description || '').replace(/"/g, '""')}"`
-        ].join(','))
-    ].join('\n');
-
-    const blob = new Blob([csvContent], { type: 'text/csv' });
-    const url = window.URL.createObjectURL(blob);
-    const a = document.createElement('a');
-    a.href = url;
-    a.download = `bids_${new Date().toISOString().split('T')[0]}.csv`;
-    a.click();
-    window.URL.revokeObjectURL(url);
+    const params = new URLSearchParams({
+        format: 'csv',
+        type: document.getElementById('filter-type').value,
+        q: document.getElementById('search-input').value
+    });
+
+    window.location.href = `/api/export?${params.toString()}`;
 }
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Per-Source Template Fingerprints
+Learns which link blocks (menus, footers, sidebars) repeat unchanged across scans
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from typing import Dict, Iterable, List, Tuple
+
+# Chrome only shortens the streak a block needs - it is never dropped on sight.
+# Navigation is chrome wherever it sits
+NAV_TAGS = {'nav'}
+NAV_ROLES = {'navigation', 'menubar', 'menu'}
+
+# Page-level chrome - but only outside <article>/<main>, where CMS entries reuse these tags
+CHROME_TAGS = {'header', 'footer', 'aside'}
+CHROME_ROLES = {'banner', 'contentinfo', 'complementary'}
+CHROME_NAMES = re.compile(r'(?:^|[-_ ])(?:nav|navbar|menu|footer|sidebar|breadcrumbs?|header|social)(?:$|[-_ ])')
+CONTENT_TAGS = {'article', 'main'}
+
+
+class TemplateStore:
+    def __init__(self, directory: str, streak: int = 3, min_block_links: int = 3,
+                 min_age_hours: float = 12, chrome_streak: int = 2):
+        self.directory = directory
+        # A block must be unchanged this many scans in a row to count as template
+        self.streak = streak
+        # ...or this many if it looks like a menu, header, footer or sidebar
+        self.chrome_streak = min(chrome_streak, streak)
+        # Single links are more likely a long-running bid than page chrome
+        self.min_block_links = min_block_links
+        # ...and unchanged for this long, so rapid refreshes can't fast-track learning
+        self.min_age_hours = min_age_hours
+        self._path_cache = {}
+
+    def _source_file(self, source_name: str) -> str:
+        slug = re.sub(r'[^a-z0-9]+', '-', source_name.lower()).strip('-')
+        return os.path.join(self.directory, f"{slug}.json")
+
+    def load(self, source_name: str) -> Dict:
+        try:
+            with open(self._source_file(source_name)) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {'blocks': {}}
+
+    def save(self, source_name: str, state: Dict):
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._source_file(source_name)
+        # Unique per thread too: a manual refresh can scan the same source as the scheduled scan
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, path)
+
+    def _element_key(self, element) -> str:
+        key = element.name
+        if element.get('id'):
+            key += f"#{element['id']}"
+        elif element.get('class'):
+            key += f".{element['class'][0]}"
+        return key
+
+    def _is_chrome(self, element, in_content: bool) -> bool:
+        if element.name in NAV_TAGS or element.get('role') in NAV_ROLES:
+            return True
+        if in_content:
+            return False
+        if element.name in CHROME_TAGS or element.get('role') in CHROME_ROLES:
+            return True
+        names = ' '.join([element.get('id') or ''] + list(element.get('class') or [])).lower()
+        return bool(names and CHROME_NAMES.search(names))
+
+    def _block_info(self, container) -> Tuple[str, bool, bool]:
+        """DOM path of a link's container, whether it is page chrome, and whether it is in content"""
+        cached = self._path_cache.get(id(container))
+        if cached is not None:
+            return cached
+
+        if container is None or container.name in (None, '[document]'):
+            info = ('', False, False)
+        else:
+            parent_path, parent_chrome, parent_content = self._block_info(container.parent)
+            key = self._element_key(container)
+            path = f"{parent_path}>{key}" if parent_path else key
+            in_content = parent_content or container.name in CONTENT_TAGS or container.get('role') == 'main'
+            is_chrome = parent_chrome or self._is_chrome(container, parent_content)
+            info = (path, is_chrome, in_content)
+
+        self._path_cache[id(container)] = info
+        return info
+
+    def filter_links(self, source_name: str, links: List) -> Tuple[List, Dict]:
+        """Drop learned template links; returns kept links and this scan's fingerprints
+
+        Pass the fingerprints to record_scan() once the kept links have been scored.
+        """
+        self._path_cache = {}
+        known_blocks = self.load(source_name).get('blocks', {})
+        now = time.time()
+
+        blocks: Dict[str, List] = {}
+        chrome = set()
+        for link in links:
+            path, is_chrome, _ = self._block_info(link.parent)
+            blocks.setdefault(path, []).append(link)
+            if is_chrome:
+                chrome.add(path)
+        self._path_cache = {}
+
+        kept = []
+        scan = {'blocks': {}, 'paths': {}}
+        for path, block_links in blocks.items():
+            signature = sorted(f"{link.get('href', '')}\t{link.get_text(strip=True)}" for link in block_links)
+            block_hash = hashlib.sha1('\n'.join(signature).encode('utf-8')).hexdigest()
+
+            previous = known_blocks.get(path, {})
+            if previous.get('hash') == block_hash:
+                block = dict(previous, streak=previous.get('streak', 0) + 1)
+            else:
+                block = {'hash': block_hash, 'streak': 1, 'first_seen': now, 'relevant': False}
+            scan['blocks'][path] = block
+
+            # Only learn from blocks that have never held a link worth keeping
+            is_template = (
+                not block.get('relevant')
+                and block['streak'] >= (self.chrome_streak if path in chrome else self.streak)
+                and len(block_links) >= self.min_block_links
+                and now - block.get('first_seen', now) >= self.min_age_hours * 3600
+            )
+            if is_template:
+                continue
+
+            kept.extend(block_links)
+            for link in block_links:
+                scan['paths'][id(link)] = path
+
+        # Preserve document order for the caller
+        kept_ids = set(scan['paths'])
+        return [link for link in links if id(link) in kept_ids], scan
+
+    def record_scan(self, source_name: str, scan: Dict, relevant_links: Iterable):
+        """Persist fingerprints, marking blocks that produced an opportunity as never-template"""
+        for link in relevant_links:
+            path = scan['paths'].get(id(link))
+            if path is not None:
+                scan['blocks'][path]['relevant'] = True
+
+        self.save(source_name, {'blocks': scan['blocks']})
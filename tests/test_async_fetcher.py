@@ -0,0 +1,149 @@
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+pytest.importorskip('aiohttp')
+
+from async_fetcher import AsyncFetcher
+
+BID_PAGE = b"""
+<html><body><ul>
+  <li><a href="/bid/1">RFP 26-01 Sanitary sewer CIPP lining project</a></li>
+</ul></body></html>
+"""
+
+
+class Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.startswith('/bytes/'):
+            self._send(200, b'a' * int(self.path.rsplit('/', 1)[1]))
+        elif self.path == '/missing':
+            self._send(404, b'not found')
+        elif self.path.startswith('/delay/'):
+            time.sleep(0.2)
+            self._send(200, b'ok')
+        elif self.path == '/slow':
+            time.sleep(1.5)
+            self._send(200, b'late')
+        elif self.path.startswith('/bids/'):
+            self._send(200, BID_PAGE)
+        else:
+            self._send(404, b'')
+
+    def _send(self, status, body):
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except OSError:
+            pass
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture(scope='module')
+def base_url():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def fetch(url, **kwargs):
+    return AsyncFetcher(**kwargs).fetch_all([url])[url]
+
+
+def test_body_under_cap_is_complete(base_url):
+    result = fetch(f"{base_url}/bytes/100", max_body_bytes=1000)
+    assert result.status == 200
+    assert result.content == b'a' * 100
+    assert not result.truncated
+
+
+def test_body_over_cap_is_truncated(base_url):
+    result = fetch(f"{base_url}/bytes/5000", max_body_bytes=1000, chunk_size=256)
+    assert result.content == b'a' * 1000
+    assert result.truncated
+
+
+def test_body_exactly_at_cap_is_not_truncated(base_url):
+    for chunk_size in (100, 1000, 4096):
+        result = fetch(f"{base_url}/bytes/1000", max_body_bytes=1000, chunk_size=chunk_size)
+        assert result.content == b'a' * 1000
+        assert not result.truncated
+
+
+def test_non_200_returns_empty_body(base_url):
+    result = fetch(f"{base_url}/missing")
+    assert result.status == 404
+    assert result.content == b''
+    assert not result.error
+
+
+def test_connect_error_is_reported():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    # Nothing listens on the port once the socket is closed
+
+    result = fetch(f"http://127.0.0.1:{port}/")
+    assert result.status == 0
+    assert result.error
+    assert result.content == b''
+
+
+def test_slow_response_times_out(base_url):
+    url = f"{base_url}/slow"
+    result = AsyncFetcher(timeout=10).fetch_all([url], timeouts={url: 0.3})[url]
+    assert result.error.startswith('Timed out after 0.3')
+    assert result.content == b''
+
+
+def test_phase_timings_are_recorded(base_url):
+    result = fetch(f"{base_url}/bytes/10", trace_timings=True)
+    assert {'first_byte', 'body'} <= set(result.timings)
+
+
+def test_pool_wait_is_reported_apart_from_first_byte(base_url):
+    urls = [f"{base_url}/delay/{i}" for i in range(3)]
+    results = AsyncFetcher(max_connections=1, max_per_host=1, trace_timings=True).fetch_all(urls)
+
+    queued = [result.timings for result in results.values() if 'queue' in result.timings]
+    assert queued
+    longest = max(queued, key=lambda timings: timings['queue'])
+    assert longest['queue'] >= 0.3
+    # The server answers each request in ~0.2s; the wait must not be blamed on it
+    assert longest['first_byte'] < 0.3
+
+
+def test_deferred_scan_survives_a_page_that_fails_to_parse(base_url, monkeypatch):
+    pytest.importorskip('requests')
+    pytest.importorskip('bs4')
+    monkeypatch.setenv('BID_TEMPLATE_SUPPRESSION', '0')
+    from bid_monitor_bot import BidMonitorBot
+
+    bot = BidMonitorBot(fetch_backend='async')
+    process_page = bot._process_page
+
+    def flaky_process_page(content, job):
+        if job['source_name'] == 'Broken':
+            raise ValueError('unparseable page')
+        return process_page(content, job)
+
+    monkeypatch.setattr(bot, '_process_page', flaky_process_page)
+
+    bot._deferred = []
+    for name in ('First', 'Broken', 'Last'):
+        bot.safe_scrape(f"{base_url}/bids/{name}", name, 'Test, OH', 'Municipal')
+    bot._scrape_deferred()
+
+    assert [opp['source'] for opp in bot.opportunities] == ['First', 'Last']
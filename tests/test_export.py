@@ -0,0 +1,113 @@
+import csv
+import io
+import re
+import zipfile
+
+import pytest
+
+pytest.importorskip('flask')
+pytest.importorskip('flask_cors')
+
+import app as web
+from bid_store import BidStore
+
+BIDS = [
+    {
+        'title': 'RFP 26-01 CIPP sanitary sewer lining', 'type': 'Municipal',
+        'location': 'Akron, OH', 'source': 'City of Akron', 'posted_date': '2026-10-01',
+        'bid_number': '26-01', 'description': 'Lining of 4,000 LF of sewer', 'score': 4.5,
+    },
+    {
+        'title': '=HYPERLINK("http://evil.example")', 'type': 'County',
+        'location': 'Summit County, OH', 'source': 'Summit County', 'posted_date': '2026-10-02',
+        'bid_number': '', 'description': 'Catch basin\x0b cleaning', 'score': 0.0,
+    },
+]
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    store = BidStore(str(tmp_path / 'bids.json'))
+    store.save(BIDS, '2026-10-02T08:00:00')
+    monkeypatch.setattr(web, 'store', store)
+    monkeypatch.setattr(web, 'embedded_scanner', False)
+    return web.app.test_client()
+
+
+def read_csv(response):
+    return list(csv.reader(io.StringIO(response.get_data(as_text=True))))
+
+
+def read_xlsx_rows(response):
+    with zipfile.ZipFile(io.BytesIO(response.get_data())) as archive:
+        assert archive.testzip() is None
+        sheet = archive.read('xl/worksheets/sheet1.xml').decode('utf-8')
+    return re.findall(r'<row>(.*?)</row>', sheet)
+
+
+def test_csv_has_header_and_rows(client):
+    response = client.get('/api/export?format=csv')
+    assert response.status_code == 200
+    assert response.mimetype == 'text/csv'
+
+    rows = read_csv(response)
+    assert rows[0] == [header for header, _ in web.EXPORT_COLUMNS]
+    assert len(rows) == 1 + len(BIDS)
+    assert rows[1][0] == BIDS[0]['title']
+
+
+def test_csv_escapes_formula_cells(client):
+    rows = read_csv(client.get('/api/export?format=csv'))
+    assert rows[2][0] == "'" + BIDS[1]['title']
+
+
+@pytest.mark.parametrize('value', ['=1+1', '+1', '-1', '@SUM(A1)', '\t=1', '\r=1'])
+def test_csv_safe_prefixes_formula_triggers(value):
+    assert web.csv_safe(value) == "'" + value
+
+
+def test_csv_applies_type_and_search_filters(client):
+    rows = read_csv(client.get('/api/export?format=csv&type=County'))
+    assert [row[1] for row in rows[1:]] == ['County']
+
+    rows = read_csv(client.get('/api/export?format=csv&q=cipp'))
+    assert [row[0] for row in rows[1:]] == [BIDS[0]['title']]
+
+
+def test_unknown_format_is_rejected(client):
+    response = client.get('/api/export?format=pdf')
+    assert response.status_code == 400
+    assert response.get_json()['success'] is False
+
+
+def test_xlsx_opens_and_keeps_values(client):
+    response = client.get('/api/export?format=xlsx')
+    assert response.status_code == 200
+    assert response.mimetype == 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+
+    header, first, second = read_xlsx_rows(response)
+    assert '>Title<' in header and '>Score<' in header
+    assert '<v>4.5</v>' in first
+    # A zero score is a value, not an empty cell
+    assert '<v>0.0</v>' in second
+    # XML-illegal control characters are stripped; formula-like text stays an inline string
+    assert 'Catch basin cleaning' in second
+    assert '\x0b' not in second
+    assert '<is><t xml:space="preserve">=HYPERLINK(' in second
+
+
+def test_xlsx_filters_rows(client):
+    rows = read_xlsx_rows(client.get('/api/export?format=xlsx&type=Municipal'))
+    assert len(rows) == 2
+
+
+def test_xlsx_loads_in_openpyxl(client):
+    openpyxl = pytest.importorskip('openpyxl')
+    response = client.get('/api/export?format=xlsx')
+
+    sheet = openpyxl.load_workbook(io.BytesIO(response.get_data())).active
+    rows = list(sheet.iter_rows(values_only=True))
+    assert sheet.title == 'Bids'
+    assert rows[0][-1] == 'Score'
+    assert rows[2][-1] == 0.0
+    assert rows[2][-2] == 'Catch basin cleaning'
@@ -0,0 +1,73 @@
+import pytest
+
+from relevance import RelevanceScorer, HIGH_WEIGHT, LOW_WEIGHT
+
+
+@pytest.fixture
+def scorer():
+    return RelevanceScorer(['sewer', 'clean', 'cleaning', 'public works', 'cipp', 'utility'])
+
+
+def test_specific_terms_outweigh_broad_ones(scorer):
+    specific, broad = scorer.score_batch([
+        ('CIPP rehabilitation', ''),
+        ('Utility department', ''),
+    ])
+    assert specific == HIGH_WEIGHT
+    assert broad == LOW_WEIGHT
+    assert broad < scorer.min_score <= specific
+
+
+def test_anchor_match_counts_more_than_parent_match(scorer):
+    in_anchor, in_parent = scorer.score_batch([
+        ('Sewer repairs 2026', 'Sewer repairs 2026'),
+        ('Repairs 2026', 'Repairs 2026 sewer'),
+    ])
+    assert in_anchor == 1.0
+    assert in_parent == pytest.approx(scorer.parent_weight)
+
+
+def test_negative_keywords_pull_score_down(scorer):
+    plain, social = scorer.score_batch([
+        ('Public works sewer page', ''),
+        ('Public works sewer on Facebook', ''),
+    ])
+    assert social < plain
+    assert social < scorer.min_score
+
+
+def test_bid_language_alone_scores_zero(scorer):
+    assert scorer.score_batch([('Open bids and RFP listings', '')]) == [0.0]
+
+
+def test_keyword_after_other_text_in_parent_still_matches(scorer):
+    # Parent text as produced by get_text(' ', strip=True)
+    [score] = scorer.score_batch([
+        ('Annual Rehab Project 2026', 'Annual Rehab Project 2026 CIPP lining bid'),
+    ])
+    assert score >= scorer.min_score
+
+
+def test_batch_keeps_scores_aligned_with_inputs(scorer):
+    pairs = [('CIPP lining', ''), ('Nothing here', ''), ('Sewer main', '')]
+    assert scorer.score_batch(pairs) == [
+        scorer.score_batch([pair])[0] for pair in pairs
+    ]
+
+
+def test_terms_match_whole_words_and_plurals(scorer):
+    counts = scorer._count_batch(['BidNet bidder newsletter cleaner', 'Sewers and CIPP bids'])
+    assert counts[0] == {}
+    assert counts[1] == {'sewer': 1, 'cipp': 1, 'bids': 1}
+
+
+def test_shared_parent_scores_each_anchor_on_the_rest(scorer):
+    parent = 'Open bids: Sewer lining RFP | Utility office hours | CIPP rehab bid'
+    anchors = ['Sewer lining RFP', 'Utility office hours', 'CIPP rehab bid']
+
+    shared = scorer.score_batch([(anchor, parent) for anchor in anchors])
+    assert shared == [scorer.score_batch([(anchor, parent)])[0] for anchor in anchors]
+    # Each anchor's own hits are not counted again as context
+    assert shared == [
+        scorer.score_batch([(anchor, parent.replace(anchor, ' '))])[0] for anchor in anchors
+    ]
@@ -0,0 +1,94 @@
+import time
+
+import pytest
+
+pytest.importorskip('requests')
+pytest.importorskip('bs4')
+
+from scan_coordinator import ScanQueue, shard_jobs
+
+
+def job(url, region='STATE AGENCIES'):
+    return {'url': url, 'source_name': url, 'region': region}
+
+
+JOBS = [
+    job('https://a.example.gov/bids', 'NORTHEAST OHIO CITIES'),
+    job('https://a.example.gov/rfps', 'CENTRAL OHIO CITIES'),
+    job('https://b.example.gov/bids', 'NORTHEAST OHIO CITIES'),
+    job('https://c.example.gov/bids'),
+]
+
+
+@pytest.fixture
+def queue(tmp_path):
+    return ScanQueue(str(tmp_path / 'queue.sqlite3'))
+
+
+def test_shard_by_region_groups_jobs():
+    shards = shard_jobs(JOBS, by='region')
+    assert sorted(shards) == ['CENTRAL OHIO CITIES', 'NORTHEAST OHIO CITIES', 'STATE AGENCIES']
+    assert len(shards['NORTHEAST OHIO CITIES']) == 2
+
+
+def test_shard_by_host_keeps_a_host_together():
+    shards = shard_jobs(JOBS, by='host', count=8)
+    hosts_by_shard = [{j['url'].split('/')[2] for j in jobs} for jobs in shards.values()]
+    shard_of_a = [i for i, hosts in enumerate(hosts_by_shard) if 'a.example.gov' in hosts]
+    assert len(shard_of_a) == 1
+    assert sum(len(jobs) for jobs in shards.values()) == len(JOBS)
+
+
+def test_shard_by_unknown_strategy_raises():
+    with pytest.raises(ValueError):
+        shard_jobs(JOBS, by='county')
+
+
+def test_claim_complete_and_collect(queue):
+    queue.enqueue('scan-1', shard_jobs(JOBS, by='region'))
+
+    first = queue.claim('worker-1')
+    second = queue.claim('worker-2')
+    assert first['id'] != second['id']
+
+    queue.complete(first['id'], [{'title': 'Sewer lining'}], {'City': {'parse': 0.1}})
+    queue.fail(second['id'], 'boom')
+    assert queue.outstanding('scan-1') == 1
+
+    merged = queue.collect('scan-1')
+    assert merged['opportunities'] == [{'title': 'Sewer lining'}]
+    assert merged['timings'] == [{'City': {'parse': 0.1}}]
+    assert len(merged['failed']) == 2
+
+
+def test_requeue_dead_worker_and_stale_claims(queue):
+    queue.enqueue('scan-1', {'only': JOBS})
+
+    shard = queue.claim('host-123')
+    assert queue.claim('host-456') is None
+
+    queue.requeue_worker('host-123')
+    assert queue.claim('host-456')['id'] == shard['id']
+
+    queue.requeue_stale(max_age=-1)
+    assert queue.claim('host-789')['id'] == shard['id']
+
+
+def test_abandoned_scans_are_not_claimed_and_expire(queue):
+    queue.enqueue('old-scan', {'only': JOBS})
+    with queue._connect() as conn:
+        conn.execute("UPDATE scans SET heartbeat = ? WHERE scan_id = 'old-scan'", (time.time() - 3600,))
+
+    queue.enqueue('new-scan', {'only': JOBS})
+    assert queue.claim('worker')['scan_id'] == 'new-scan'
+
+    queue.expire_abandoned()
+    assert queue.collect('old-scan')['failed'] == []
+    assert queue.outstanding('old-scan') == 0
+
+
+def test_purge_removes_scan(queue):
+    queue.enqueue('scan-1', {'only': JOBS})
+    queue.purge('scan-1')
+    assert queue.claim('worker') is None
+    assert queue.collect('scan-1') == {'opportunities': [], 'timings': [], 'failed': []}
@@ -0,0 +1,62 @@
+import pytest
+
+from scan_profiler import ScanProfiler
+
+
+def test_bad_env_mode_warns_and_turns_profiling_off(monkeypatch, capsys):
+    monkeypatch.setenv('SCAN_PROFILE', 'stage')
+    profiler = ScanProfiler.from_env()
+    assert not profiler.enabled
+    assert 'Ignoring SCAN_PROFILE' in capsys.readouterr().out
+
+
+def test_explicit_bad_mode_is_rejected():
+    with pytest.raises(ValueError):
+        ScanProfiler.from_env('stage')
+
+
+def test_capture_modes_fall_back_to_stages_with_a_note(tmp_path):
+    profiler = ScanProfiler('cprofile', output_dir=str(tmp_path))
+    profiler.limit_to_stages('sharded scans run in worker processes')
+    profiler.start()
+    profiler.record('City', 'parse', 0.5)
+    profiler.stop()
+
+    report = profiler.report()
+    assert report['mode'] == 'stages'
+    assert report['notes'] and 'cprofile' in report['notes'][0]
+    assert 'profile_file' not in report
+    assert report['slowest_sources'][0]['source'] == 'City'
+
+
+def test_unwritable_capture_becomes_a_note(tmp_path):
+    blocker = tmp_path / 'not-a-dir'
+    blocker.write_text('')
+    profiler = ScanProfiler('cprofile', output_dir=str(blocker / 'profiles'))
+    profiler.start()
+    profiler.stop()
+
+    report = profiler.report()
+    assert report['enabled']
+    assert 'profile_file' not in report
+    assert any('capture not saved' in note for note in report['notes'])
+
+
+def test_scan_results_are_saved_when_capture_fails(tmp_path, monkeypatch):
+    pytest.importorskip('requests')
+    pytest.importorskip('bs4')
+    import bid_monitor_bot
+    from bid_store import BidStore
+    from scanner import run_scan
+
+    blocker = tmp_path / 'not-a-dir'
+    blocker.write_text('')
+    monkeypatch.setenv('SCAN_PROFILE_DIR', str(blocker / 'profiles'))
+    monkeypatch.setenv('BID_TEMPLATE_SUPPRESSION', '0')
+    monkeypatch.delenv('SCAN_MODE', raising=False)
+    monkeypatch.setattr(bid_monitor_bot.BidMonitorBot, 'run_all_scrapers',
+                        lambda self: [{'title': 'Sewer lining', 'score': 3.0}])
+
+    store = BidStore(str(tmp_path / 'bids.json'))
+    assert run_scan(store, 'cprofile')
+    assert store.load()['bids'] == [{'title': 'Sewer lining', 'score': 3.0}]
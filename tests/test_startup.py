@@ -0,0 +1,10 @@
+import pytest
+
+pytest.importorskip('flask')
+pytest.importorskip('flask_cors')
+
+import startup_check
+
+
+def test_web_tier_starts_within_budget_without_scraping_stack():
+    assert startup_check.main() == 0
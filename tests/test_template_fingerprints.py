@@ -0,0 +1,123 @@
+import threading
+
+import pytest
+
+bs4 = pytest.importorskip('bs4')
+
+from relevance import RelevanceScorer
+from template_fingerprints import TemplateStore
+
+BID_TABLE_PAGE = """
+<html><body>
+<header><a href="/">City Home - Public Works Department</a></header>
+<nav>
+  <a href="/about">About the city government</a>
+  <a href="/departments">City departments and offices</a>
+  <a href="/contact">Contact city hall staff</a>
+</nav>
+<ul class="links">
+  <li><a href="/council">City council meeting schedule</a></li>
+  <li><a href="/parks">Parks and recreation programs</a></li>
+  <li><a href="/permits">Building permit applications</a></li>
+</ul>
+<table id="open-bids">
+  <tr><td><a href="/bid/1">RFP 26-01 CIPP sanitary sewer lining</a></td></tr>
+  <tr><td><a href="/bid/2">Catch basin cleaning contract 2026</a></td></tr>
+  <tr><td><a href="/bid/3">Storm sewer televising and CCTV inspection</a></td></tr>
+</table>
+<main><article><header><a href="/bid/4">Lift station rehabilitation bid</a></header></article></main>
+</body></html>
+"""
+
+
+def scan(store, scorer, html=BID_TABLE_PAGE, source='City of Test'):
+    """One pass of the bot's filter -> score -> record flow; returns kept hrefs"""
+    links = bs4.BeautifulSoup(html, 'html.parser').find_all('a', href=True)
+    kept, fingerprints = store.filter_links(source, links)
+    scores = scorer.score_batch([(link.get_text(' ', strip=True), '') for link in kept])
+    store.record_scan(source, fingerprints, [
+        link for link, score in zip(kept, scores) if score >= scorer.min_score
+    ])
+    return [link['href'] for link in kept]
+
+
+@pytest.fixture
+def scorer():
+    return RelevanceScorer(['sewer', 'cleaning', 'public works', 'cipp', 'cctv', 'lift station'])
+
+
+def test_stable_bid_table_is_never_learned_as_template(tmp_path, scorer):
+    store = TemplateStore(str(tmp_path), streak=3, min_age_hours=0)
+
+    for _ in range(5):
+        kept = scan(store, scorer)
+        assert {'/bid/1', '/bid/2', '/bid/3'} <= set(kept)
+
+
+def test_stable_irrelevant_block_is_suppressed(tmp_path, scorer):
+    store = TemplateStore(str(tmp_path), streak=3, min_age_hours=0)
+
+    assert '/council' in scan(store, scorer)
+    assert '/council' in scan(store, scorer)
+    assert '/council' not in scan(store, scorer)
+
+
+def test_learning_needs_minimum_age(tmp_path, scorer):
+    store = TemplateStore(str(tmp_path), streak=3, min_age_hours=12)
+
+    for _ in range(5):
+        assert '/council' in scan(store, scorer)
+
+
+def test_chrome_block_needs_a_shorter_streak_not_zero(tmp_path, scorer):
+    store = TemplateStore(str(tmp_path), streak=3, chrome_streak=2, min_age_hours=0)
+
+    first = scan(store, scorer)
+    assert {'/', '/about', '/bid/4'} <= set(first)
+
+    second = scan(store, scorer)
+    assert '/about' not in second
+    assert '/council' in second
+    # Single-link chrome is still kept, as for any other block
+    assert '/' in second
+
+
+SIDEBAR_PAGE = """
+<html><body>
+<div class="content"><p>Welcome to the city website.</p></div>
+<div class="sidebar">
+  <h3>Current Bids</h3>
+  <a href="/bid/9">RFP 26-09 Sanitary sewer CIPP lining project</a>
+  <a href="/calendar">Community events calendar</a>
+  <a href="/news">Latest city news releases</a>
+</div>
+</body></html>
+"""
+
+
+def test_sidebar_bid_is_kept_and_protects_its_block(tmp_path, scorer):
+    store = TemplateStore(str(tmp_path), streak=3, chrome_streak=2, min_age_hours=0)
+
+    for _ in range(5):
+        assert '/bid/9' in scan(store, scorer, html=SIDEBAR_PAGE)
+
+
+def test_concurrent_saves_of_one_source_stay_valid(tmp_path):
+    store = TemplateStore(str(tmp_path))
+    errors = []
+
+    def save_many(worker):
+        try:
+            for i in range(25):
+                store.save('City of Test', {'blocks': {f"div.w{worker}": {'streak': i}}})
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=save_many, args=(worker,)) for worker in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    assert len(store.load('City of Test')['blocks']) == 1